@@ -1,37 +1,93 @@
 """Run Deep Research from command line."""
 
 import asyncio
+import functools
+import time
+import uuid
 import warnings
 
+from deep_research.checkpoint import CompressedMemorySaver
+from deep_research.config import ENABLE_CHECKPOINT
+from deep_research.research_agent_full import deep_researcher_builder
 from langchain_core.messages import HumanMessage
-from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.checkpoint.base import BaseCheckpointSaver
 from rich.console import Console
+from rich.live import Live
 from rich.markdown import Markdown
 
-from src.research_agent_full import deep_researcher_builder
+# Use the libuv-based event loop for the I/O-bound agent run when available
+# (uvloop is not supported on Windows; fall back to the default loop there).
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
 
 # ===== FILL IN YOUR RESEARCH QUERY HERE =====
 QUERY = "一位欧洲学者的某项开源硬件项目，其灵感源于一个著名的元胞自动机，该项目的一个早期物理设计从四边形框架演变为更稳固的三角形结构。这位在机械工程某一分支领域深耕的学者，从大学教职岗位上引退后，继续领导一个与该项目相关的商业实体。该实体在21世纪10年代中期停止了在其欧洲本土的主要交易，但其在一个亚洲国家的业务得以延续。这个商业实体的英文名称是什么？要求格式形如：Alibaba Group Limited。"
 # =============================================
 
+# Graph node whose LLM tokens are rendered live
+REPORT_NODE = "final_report_generation"
+# Minimum seconds between markdown re-renders; each render re-parses the whole report
+RENDER_INTERVAL = 0.5
+
 warnings.filterwarnings("ignore")
 
 
-async def main():
-    """Run the deep research agent."""
-    checkpointer = InMemorySaver()
-    agent = deep_researcher_builder.compile(checkpointer=checkpointer)
+@functools.cache
+def compile_agent(checkpointer_cls: type[BaseCheckpointSaver] | None = None):
+    """Compile the research graph once per checkpointer type.
+
+    Args:
+        checkpointer_cls: Checkpointer class to instantiate, or None to run without one
+
+    Returns:
+        The compiled graph, reused by every subsequent call with the same type
+    """
+    checkpointer = checkpointer_cls() if checkpointer_cls is not None else None
+    return deep_researcher_builder.compile(checkpointer=checkpointer)
+
 
-    config = {"configurable": {"thread_id": "1", "recursion_limit": 10}}
+# Compiled at import so repeated invocations (e.g. from a server) reuse it.
+# Per-step state snapshots are skipped unless resuming is explicitly requested.
+_AGENT = compile_agent(CompressedMemorySaver if ENABLE_CHECKPOINT else None)
 
-    result = await agent.ainvoke(
-        {"messages": [HumanMessage(content=QUERY)]},
-        config=config,
-    )
+
+async def main():
+    """Run the deep research agent, streaming the final report as it is written."""
+    config = {"configurable": {"recursion_limit": 10}}
+    if ENABLE_CHECKPOINT:
+        # The compiled agent and its checkpointer are shared, so each run needs
+        # its own thread or it would resume the previous run's state
+        config["configurable"]["thread_id"] = str(uuid.uuid4())
 
     console = Console()
-    console.print(Markdown(result["final_report"]))
+    report_chunks = []
+    last_render = 0.0
+    final_state = {}
+
+    with Live(console=console, auto_refresh=False, vertical_overflow="visible") as live:
+        async for mode, chunk in _AGENT.astream(
+            {"messages": [HumanMessage(content=QUERY)]},
+            config=config,
+            stream_mode=["messages", "values"],
+        ):
+            if mode == "values":
+                final_state = chunk
+                continue
+
+            message, metadata = chunk
+            if metadata.get("langgraph_node") == REPORT_NODE and isinstance(message.content, str):
+                report_chunks.append(message.content)
+                now = time.monotonic()
+                if now - last_render >= RENDER_INTERVAL:
+                    live.update(Markdown("".join(report_chunks)), refresh=True)
+                    last_render = now
+
+        live.update(Markdown(final_state.get("final_report", "".join(report_chunks))), refresh=True)
 
 
 if __name__ == "__main__":
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
     asyncio.run(main())
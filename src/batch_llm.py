@@ -0,0 +1,185 @@
+"""OpenAI Batch API Routing.
+
+This module provides a wrapper that collects concurrent async calls to an
+OpenAI chat model and submits them together through the Batch API, which is
+billed at half the price of synchronous requests. Batches may take minutes
+(up to the 24h completion window) to finish, so it is only suitable for
+calls that are not on the user-facing critical path, such as research
+compression when several researchers finish together.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from typing import Any
+
+from langchain_core.messages import AIMessage, BaseMessage, convert_to_openai_messages
+from langchain_core.runnables import Runnable, RunnableConfig
+
+logger = logging.getLogger(__name__)
+
+_TERMINAL_BATCH_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+class BatchLLMWrapper(Runnable):
+    """Route concurrent ``ainvoke`` calls to an OpenAI chat model through the Batch API.
+
+    Calls arriving within ``window`` seconds of each other are submitted as a
+    single batch job and resolved when its results are available. Windows
+    holding fewer than ``min_batch_size`` calls, calls with extra invocation
+    kwargs, synchronous calls, and requests the batch fails to answer all go
+    directly to the model instead. A batch still running after ``max_wait``
+    seconds is cancelled and its calls are made directly.
+    """
+
+    def __init__(
+        self,
+        model: Any,
+        window: float = 0.2,
+        min_batch_size: int = 2,
+        poll_interval: float = 15.0,
+        max_wait: float = 600.0,
+    ):
+        """Wrap an OpenAI chat model.
+
+        Args:
+            model: ChatOpenAI instance; its async client and settings are reused
+            window: Seconds to wait for more calls before submitting a batch
+            min_batch_size: Smallest number of calls worth a batch job
+            poll_interval: Seconds between batch status checks
+            max_wait: Seconds to wait for a batch before cancelling it
+        """
+        self.model = model
+        self.window = window
+        self.min_batch_size = min_batch_size
+        self.poll_interval = poll_interval
+        self.max_wait = max_wait
+        self._pending: list[tuple[list[BaseMessage], RunnableConfig | None, asyncio.Future]] = []
+        # Strong references to running flushes so they are not garbage collected
+        self._flush_tasks: set[asyncio.Task] = set()
+
+    # ===== RUNNABLE INTERFACE =====
+
+    def invoke(self, input: Any, config: RunnableConfig | None = None, **kwargs: Any) -> Any:
+        """Call the model directly; batching only applies to async calls."""
+        return self.model.invoke(input, config, **kwargs)
+
+    async def ainvoke(self, input: Any, config: RunnableConfig | None = None, **kwargs: Any) -> Any:
+        """Queue the call for the next batch and wait for its result."""
+        if kwargs or not isinstance(input, list):
+            return await self.model.ainvoke(input, config, **kwargs)
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((input, config, future))
+        if len(self._pending) == 1:
+            # First call of a new window; earlier windows may still be running their batch
+            task = asyncio.create_task(self._flush_after_window())
+            self._flush_tasks.add(task)
+            task.add_done_callback(self._flush_tasks.discard)
+        return await future
+
+    # ===== BATCHING =====
+
+    async def _invoke_directly(self, messages: list[BaseMessage], config: RunnableConfig | None, future: asyncio.Future) -> None:
+        if future.done():
+            return  # Caller was cancelled while waiting
+        try:
+            result = await self.model.ainvoke(messages, config)
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+            return
+        if not future.done():
+            future.set_result(result)
+
+    async def _flush_after_window(self) -> None:
+        await asyncio.sleep(self.window)
+        pending, self._pending = self._pending, []
+
+        if len(pending) < self.min_batch_size:
+            await asyncio.gather(*(self._invoke_directly(*call) for call in pending))
+            return
+
+        try:
+            results = await self._run_batch([messages for messages, _, _ in pending])
+        except Exception as e:
+            logger.warning("Batch API request failed, calling model directly: %s", e)
+            results = {}
+
+        fallbacks = []
+        for i, call in enumerate(pending):
+            future = call[2]
+            if i not in results:
+                fallbacks.append(self._invoke_directly(*call))
+            elif not future.done():
+                future.set_result(results[i])
+        await asyncio.gather(*fallbacks)
+
+    def _request_body(self, messages: list[BaseMessage]) -> dict:
+        body = {
+            "model": self.model.model_name,
+            "messages": convert_to_openai_messages(messages),
+        }
+        if self.model.max_tokens is not None:
+            body["max_completion_tokens"] = self.model.max_tokens
+        return body
+
+    async def _run_batch(self, batch: list[list[BaseMessage]]) -> dict[int, AIMessage]:
+        """Submit a batch job and wait for it to finish.
+
+        Returns:
+            Mapping from position in ``batch`` to response, for successful requests only
+        """
+        client = self.model.root_async_client
+        lines = [
+            json.dumps({
+                "custom_id": str(i),
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": self._request_body(messages),
+            })
+            for i, messages in enumerate(batch)
+        ]
+        input_file = await client.files.create(
+            file=("batch.jsonl", "\n".join(lines).encode("utf-8")),
+            purpose="batch",
+        )
+        job = await client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+        )
+        logger.info("Submitted batch %s with %d requests", job.id, len(batch))
+
+        deadline = time.monotonic() + self.max_wait
+        while job.status not in _TERMINAL_BATCH_STATUSES:
+            if time.monotonic() >= deadline:
+                try:
+                    await client.batches.cancel(job.id)
+                except Exception as e:
+                    logger.warning("Failed to cancel batch %s: %s", job.id, e)
+                raise TimeoutError(f"Batch {job.id} did not finish within {self.max_wait:g}s")
+            await asyncio.sleep(self.poll_interval)
+            job = await client.batches.retrieve(job.id)
+        if job.status != "completed" or not job.output_file_id:
+            raise RuntimeError(f"Batch {job.id} ended with status {job.status}")
+
+        output = await client.files.content(job.output_file_id)
+        results = {}
+        for line in output.text.splitlines():
+            record = json.loads(line)
+            response = record.get("response") or {}
+            if record.get("error") or response.get("status_code") != 200:
+                continue
+            body = response["body"]
+            usage = body.get("usage") or {}
+            results[int(record["custom_id"])] = AIMessage(
+                content=body["choices"][0]["message"].get("content") or "",
+                response_metadata={"model_name": body.get("model"), "batch_id": job.id},
+                usage_metadata={
+                    "input_tokens": usage.get("prompt_tokens", 0),
+                    "output_tokens": usage.get("completion_tokens", 0),
+                    "total_tokens": usage.get("total_tokens", 0),
+                },
+            )
+        return results
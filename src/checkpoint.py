@@ -0,0 +1,63 @@
+"""Compressed In-Memory Checkpointing.
+
+This module provides an in-memory checkpointer whose stored snapshots are
+zstd-compressed. Long research runs accumulate large notes and message
+histories in state, and keeping every per-step snapshot uncompressed makes
+resident memory grow quickly.
+"""
+
+from typing import Any
+
+import zstandard
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.checkpoint.serde.base import SerializerProtocol
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+_ZSTD_SUFFIX = "+zstd"
+
+class ZstdSerializer(SerializerProtocol):
+    """Serializer that zstd-compresses the output of another serializer.
+
+    The wrapped serializer handles LangChain messages and Pydantic models;
+    this layer only compresses its bytes and tags the type so that payloads
+    written without compression can still be read back.
+    """
+
+    def __init__(self, serde: SerializerProtocol | None = None, level: int = 3):
+        """Wrap a serializer.
+
+        Args:
+            serde: Serializer producing the bytes to compress (JsonPlusSerializer by default)
+            level: zstd compression level
+        """
+        self.serde = serde or JsonPlusSerializer()
+        self._compressor = zstandard.ZstdCompressor(level=level)
+        self._decompressor = zstandard.ZstdDecompressor()
+
+    def dumps_typed(self, obj: Any) -> tuple[str, bytes]:
+        """Serialize and compress an object."""
+        type_, data = self.serde.dumps_typed(obj)
+        return type_ + _ZSTD_SUFFIX, self._compressor.compress(data)
+
+    def loads_typed(self, data: tuple[str, bytes]) -> Any:
+        """Decompress and deserialize an object."""
+        type_, payload = data
+        if type_.endswith(_ZSTD_SUFFIX):
+            type_ = type_[: -len(_ZSTD_SUFFIX)]
+            payload = self._decompressor.decompress(payload)
+        return self.serde.loads_typed((type_, payload))
+
+class CompressedMemorySaver(InMemorySaver):
+    """InMemorySaver that keeps checkpoints and pending writes zstd-compressed.
+
+    Storage is still the in-process dict keyed by thread, namespace, and
+    checkpoint id; only the stored payloads change.
+    """
+
+    def __init__(self, *, level: int = 3):
+        """Create the saver.
+
+        Args:
+            level: zstd compression level
+        """
+        super().__init__(serde=ZstdSerializer(level=level))
@@ -4,49 +4,37 @@ Loads settings from .env file with fallback to system environment variables.
 All model instances and system constants are configured here.
 """
 
-import os
+import asyncio
+import atexit
+import functools
 from pathlib import Path
 
+import httpx
+from deep_research.batch_llm import BatchLLMWrapper
+from deep_research.prompt_cache import (
+    ANTHROPIC_PROMPT_CACHE_BETA,
+    PromptCachedModel,
+    prompt_cache_usage,
+)
+from deep_research.semantic_cache import SemanticCacheWrapper, message_key
 from dotenv import load_dotenv
 from langchain.chat_models import init_chat_model
+from langchain_core.rate_limiters import InMemoryRateLimiter
+from langchain_openai import OpenAIEmbeddings
+from pydantic import model_validator
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
-# Load .env file from project root, with override=False to respect existing env vars
+# Load .env file from project root, with override=False to respect existing env vars.
+# Provider SDKs read their API keys from os.environ, so this stays alongside Settings.
 try:
     _project_root = Path(__file__).resolve().parent.parent
 except NameError:
     _project_root = Path.cwd()
 load_dotenv(_project_root / ".env", override=False)
 
-# --- API Keys ---
-# Read implicitly by langchain (OPENAI_API_KEY) and tavily (TAVILY_API_KEY).
-# Exposed here for optional explicit validation.
-OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY", "")
-TAVILY_API_KEY: str = os.getenv("TAVILY_API_KEY", "")
-
-# --- Model Names ---
-DEFAULT_MODEL: str = os.getenv("DEFAULT_MODEL", "openai:gpt-5")
-SUPERVISOR_MODEL: str = os.getenv("SUPERVISOR_MODEL", "openai:gpt-5")
-SUMMARIZATION_MODEL: str = os.getenv("SUMMARIZATION_MODEL", "openai:gpt-5")
-COMPRESS_MODEL: str = os.getenv("COMPRESS_MODEL", "openai:gpt-5")
-WRITER_MODEL: str = os.getenv("WRITER_MODEL", "openai:gpt-5")
-
-# --- Model Token Limits ---
-COMPRESS_MODEL_MAX_TOKENS: int = int(os.getenv("COMPRESS_MODEL_MAX_TOKENS", "32000"))
-REPORT_WRITER_MODEL_MAX_TOKENS: int = int(os.getenv("REPORT_WRITER_MODEL_MAX_TOKENS", "40000"))
-DRAFT_WRITER_MODEL_MAX_TOKENS: int = int(os.getenv("DRAFT_WRITER_MODEL_MAX_TOKENS", "32000"))
-
-# --- API Base URLs (optional, None means use official default endpoint) ---
-OPENAI_BASE_URL: str | None = os.getenv("OPENAI_BASE_URL") or None
-ANTHROPIC_BASE_URL: str | None = os.getenv("ANTHROPIC_BASE_URL") or None
-
-# --- Research Parameters ---
-MAX_RESEARCHER_ITERATIONS: int = int(os.getenv("MAX_RESEARCHER_ITERATIONS", "15"))
-MAX_CONCURRENT_RESEARCHERS: int = int(os.getenv("MAX_CONCURRENT_RESEARCHERS", "3"))
-MAX_CONTEXT_LENGTH: int = int(os.getenv("MAX_CONTEXT_LENGTH", "250000"))
-
-
-# --- Model Instance Factory ---
+# --- Settings ---
 
+@functools.lru_cache(maxsize=64)
 def _parse_provider(model_name: str) -> str | None:
     """Extract the provider name from a model string.
 
@@ -65,53 +53,403 @@ def _parse_provider(model_name: str) -> str | None:
     return None
 
 
-def _get_base_url(model_name: str) -> str | None:
-    """Determine the base_url based on the model's provider prefix.
+class Settings(BaseSettings):
+    """Typed settings parsed once from the environment and the project .env file.
+
+    Environment variables take precedence over .env values; names are matched
+    case-insensitively (e.g. DEFAULT_MODEL sets default_model). Empty values
+    fall back to the defaults below.
+    """
+
+    model_config = SettingsConfigDict(
+        env_file=_project_root / ".env",
+        env_file_encoding="utf-8",
+        env_ignore_empty=True,
+        extra="ignore",
+    )
+
+    # --- API Keys ---
+    # Read implicitly by langchain (OPENAI_API_KEY, ANTHROPIC_API_KEY) and
+    # tavily (TAVILY_API_KEY). Exposed here for explicit validation.
+    openai_api_key: str = ""
+    anthropic_api_key: str = ""
+    tavily_api_key: str = ""
+
+    # --- Model Names ---
+    default_model: str = "openai:gpt-5"
+    supervisor_model: str = "openai:gpt-5"
+    summarization_model: str = "openai:gpt-5"
+    compress_model: str = "openai:gpt-5"
+    writer_model: str = "openai:gpt-5"
+
+    # --- Model Token Limits ---
+    compress_model_max_tokens: int = 32000
+    report_writer_model_max_tokens: int = 40000
+    draft_writer_model_max_tokens: int = 32000
+
+    # --- Report Writing ---
+    # Pass the draft report as an OpenAI predicted output when writing the final
+    # report. Only some OpenAI models (gpt-4o / gpt-4.1 families) support it.
+    report_use_prediction: bool = False
+
+    # --- API Base URLs (optional, None means use official default endpoint) ---
+    openai_base_url: str | None = None
+    anthropic_base_url: str | None = None
+
+    # --- Research Parameters ---
+    max_researcher_iterations: int = 15
+    max_concurrent_researchers: int = 3
+    max_context_length: int = 250000
+
+    # --- Provider Rate Limits (requests per minute, 0 disables) ---
+    openai_requests_per_minute: int = 500
+    anthropic_requests_per_minute: int = 50
+
+    # --- Researcher Context Management ---
+    # Once more than N researcher turns are unsummarized, all but the latest are
+    # folded into a rolling summary of about MAX_TOKENS. Set N to 0 to disable.
+    rolling_summary_every_n_turns: int = 3
+    rolling_summary_max_tokens: int = 2000
+
+    # --- Runtime Options ---
+    # Checkpointing is only needed to resume or inspect a thread; the CLI does neither.
+    enable_checkpoint: bool = False
+    # Route research compression through the OpenAI Batch API (half price, higher latency)
+    use_batch_api: bool = False
+    # Seconds to wait for a batch before cancelling it and calling the model directly
+    batch_api_max_wait: int = 600
+
+    # --- Semantic Cache (optional, requires faiss-cpu) ---
+    semantic_cache_enabled: bool = False
+    semantic_cache_threshold: float = 0.92
+    semantic_cache_ttl: int = 3600
+    semantic_cache_embedding_model: str = "text-embedding-3-small"
+    semantic_cache_dir: str | None = None
+
+    @model_validator(mode="after")
+    def _require_llm_api_key(self) -> "Settings":
+        """Fail fast at import, before any model is constructed, if no LLM key is set."""
+        if not (self.openai_api_key or self.anthropic_api_key):
+            raise ValueError(
+                "No LLM API key configured: set OPENAI_API_KEY or ANTHROPIC_API_KEY "
+                "in the environment or in .env"
+            )
+        return self
+
+    @model_validator(mode="after")
+    def _require_openai_writer_for_prediction(self) -> "Settings":
+        """Reject predicted outputs for writer models whose provider lacks them."""
+        if self.report_use_prediction and _parse_provider(self.writer_model) != "openai":
+            raise ValueError(
+                "REPORT_USE_PREDICTION requires an OpenAI WRITER_MODEL (e.g. openai:gpt-4.1), "
+                f"got {self.writer_model!r}"
+            )
+        return self
+
+
+settings = Settings()
+
+
+def __getattr__(name: str):
+    """Expose settings under their upper-case module-level names (e.g. MAX_CONTEXT_LENGTH)."""
+    field = name.lower()
+    if name.isupper() and field in Settings.model_fields:
+        return getattr(settings, field)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# --- Shared HTTP Client ---
+# A single keep-alive connection pool reused by every OpenAI-compatible model,
+# so concurrent researchers multiplex over warm HTTP/2 connections instead of
+# paying a TLS handshake per client.
+
+
+class _LoopLocalTransport(httpx.AsyncBaseTransport):
+    """Transport that keeps a separate connection pool per event loop.
+
+    Pooled connections belong to the loop that opened them, while the models
+    holding the shared client are cached for the life of the process. Each
+    asyncio.run() therefore gets its own pool instead of reusing sockets of a
+    closed loop.
+    """
+
+    def __init__(self, **transport_kwargs):
+        """Store the settings used to build each loop's transport."""
+        self._transport_kwargs = transport_kwargs
+        self._transports: dict[asyncio.AbstractEventLoop, httpx.AsyncHTTPTransport] = {}
+
+    def _current(self) -> httpx.AsyncHTTPTransport:
+        loop = asyncio.get_running_loop()
+        transport = self._transports.get(loop)
+        if transport is None:
+            # Pools of finished loops can no longer be used or closed; forget them
+            self._transports = {
+                other: t for other, t in self._transports.items() if not other.is_closed()
+            }
+            transport = self._transports[loop] = httpx.AsyncHTTPTransport(**self._transport_kwargs)
+        return transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        """Send the request over the running loop's connection pool."""
+        return await self._current().handle_async_request(request)
+
+    async def aclose(self) -> None:
+        """Close the running loop's connection pool."""
+        transport = self._transports.pop(asyncio.get_running_loop(), None)
+        if transport is not None:
+            await transport.aclose()
+
+
+_SHARED_HTTPX = httpx.AsyncClient(
+    timeout=60,
+    transport=_LoopLocalTransport(
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+        http2=True,
+    ),
+)
+
+
+# --- Model Instance Factory ---
+
+# Base URL per provider prefix (None means use the official default endpoint)
+_PROVIDER_BASE_URLS: dict[str, str | None] = {
+    "openai": settings.openai_base_url,
+    "anthropic": settings.anthropic_base_url,
+}
+
+
+
+def _build_rate_limiter(requests_per_minute: int) -> InMemoryRateLimiter | None:
+    """Create a token-bucket limiter shared by every model of one provider.
 
     Args:
-        model_name: Model name string.
+        requests_per_minute: Allowed request rate; 0 or less disables limiting.
 
     Returns:
-        The base_url for the provider, or None if not set.
+        The rate limiter, or None if limiting is disabled.
     """
-    provider = _parse_provider(model_name)
-    if provider == "openai":
-        return OPENAI_BASE_URL
-    if provider == "anthropic":
-        return ANTHROPIC_BASE_URL
-    return None
+    if requests_per_minute <= 0:
+        return None
+    return InMemoryRateLimiter(
+        requests_per_second=requests_per_minute / 60,
+        max_bucket_size=max(1, settings.max_concurrent_researchers * 2),
+    )
+
 
+# Pacing requests per provider avoids bursts of 429s and their retry backoff
+_PROVIDER_RATE_LIMITERS: dict[str, InMemoryRateLimiter | None] = {
+    "openai": _build_rate_limiter(settings.openai_requests_per_minute),
+    "anthropic": _build_rate_limiter(settings.anthropic_requests_per_minute),
+}
 
-def create_chat_model(model_name: str, **kwargs):
+
+def _freeze_kwargs(kwargs: dict) -> tuple:
+    """Convert keyword arguments into a hashable, order-independent cache key.
+
+    Args:
+        kwargs: Keyword arguments destined for init_chat_model.
+
+    Returns:
+        Sorted tuple of (name, value) pairs.
+    """
+    return tuple(sorted(kwargs.items()))
+
+
+def create_chat_model(model_name: str, enable_prompt_cache: bool = True, **kwargs):
     """Create a chat model instance with centralized configuration.
 
     Supports both "provider:model" (LangChain native) and "provider/model"
     (OpenRouter) formats. For "provider/model" format, automatically sets
     model_provider and passes the full string as the model name.
 
+    Identical (model_name, kwargs) combinations return the same cached
+    instance, so aliases that resolve to the same model share one client
+    and its connection pool.
+
     Args:
         model_name: Model name in "provider:model" or "provider/model" format.
-        **kwargs: Additional arguments passed to init_chat_model.
+        enable_prompt_cache: Whether to enable provider prompt caching and
+            track cached input tokens.
+        **kwargs: Additional arguments passed to init_chat_model. Values
+            must be hashable.
 
     Returns:
         A configured BaseChatModel instance.
     """
-    base_url = _get_base_url(model_name)
+    return _create_chat_model(model_name, enable_prompt_cache, _freeze_kwargs(kwargs))
+
+
+@functools.lru_cache(maxsize=32)
+def _create_chat_model(model_name: str, enable_prompt_cache: bool, frozen_kwargs: tuple):
+    """Build a chat model instance; cached by create_chat_model."""
+    kwargs = dict(frozen_kwargs)
+    base_url = _PROVIDER_BASE_URLS.get(_parse_provider(model_name))
     if base_url is not None:
         kwargs.setdefault("base_url", base_url)
     # "provider/model" format (e.g. OpenRouter): extract provider explicitly
     if ":" not in model_name and "/" in model_name:
         provider = model_name.split("/", 1)[0]
         kwargs.setdefault("model_provider", provider)
+    # Stream tokens so callers (and LangGraph "messages" streaming) see output early
+    kwargs.setdefault("streaming", True)
+    provider = kwargs.get("model_provider", _parse_provider(model_name))
+    # Async calls from OpenAI-compatible models share one connection pool
+    if provider == "openai":
+        kwargs.setdefault("http_async_client", _SHARED_HTTPX)
+        # Keep usage (incl. cached tokens) reported on streamed responses
+        kwargs.setdefault("stream_usage", True)
+    rate_limiter = _PROVIDER_RATE_LIMITERS.get(provider)
+    if rate_limiter is not None:
+        kwargs.setdefault("rate_limiter", rate_limiter)
+    if enable_prompt_cache:
+        if _parse_provider(model_name) == "anthropic":
+            kwargs.setdefault("default_headers", {"anthropic-beta": ANTHROPIC_PROMPT_CACHE_BETA})
+        kwargs.setdefault("callbacks", [prompt_cache_usage])
     return init_chat_model(model=model_name, **kwargs)
 
 
-# --- Pre-built Model Instances ---
-# Module-level singletons imported by other modules.
+def with_prompt_cache(model, model_name: str) -> PromptCachedModel:
+    """Wrap a model so its static system prompt leads and is cacheable.
+
+    Args:
+        model: Chat model returned by create_chat_model.
+        model_name: Model name the instance was created from.
+
+    Returns:
+        The model wrapped with provider-specific prompt cache preparation.
+    """
+    return PromptCachedModel(model, _parse_provider(model_name))
+
+
+def with_batch_api(model, model_name: str):
+    """Route a model's async calls through the OpenAI Batch API when enabled.
+
+    Args:
+        model: Chat model returned by create_chat_model.
+        model_name: Model name the instance was created from.
+
+    Returns:
+        The wrapped model, or the model unchanged if batching is disabled or
+        the provider is not OpenAI.
+    """
+    if not settings.use_batch_api or _parse_provider(model_name) != "openai":
+        return model
+    return BatchLLMWrapper(model, max_wait=settings.batch_api_max_wait)
+
+
+def with_semantic_cache(model, name: str, key_fn=message_key):
+    """Front a model with the semantic response cache when it is enabled.
+
+    Args:
+        model: Model (or runnable) to wrap.
+        name: Cache name, used as the file stem when persisting to SEMANTIC_CACHE_DIR.
+        key_fn: Extracts the variable (non-template) content of an input.
+
+    Returns:
+        The wrapped model, or the model unchanged if the cache is disabled.
+    """
+    if not settings.semantic_cache_enabled:
+        return model
+    cache_dir = settings.semantic_cache_dir
+    index_path = Path(cache_dir) / f"{name}.faiss" if cache_dir else None
+    cached_model = SemanticCacheWrapper(
+        model,
+        models.embeddings,
+        threshold=settings.semantic_cache_threshold,
+        ttl=settings.semantic_cache_ttl,
+        index_path=index_path,
+        key_fn=key_fn,
+    )
+    if index_path is not None:
+        atexit.register(cached_model.persist)
+    return cached_model
+
+
+def _research_findings_key(messages) -> str:
+    """Key compression calls on the research messages, without the trailing fixed instruction."""
+    return message_key(messages[:-1])
+
+
+# --- Model Instances ---
+# Each model is constructed on first attribute access and reused afterwards;
+# aliases pointing at the same model and settings share a single instance
+# through the create_chat_model cache.
+
+class _Models:
+    """Lazily constructed chat models used throughout the research workflow."""
+
+    @functools.cached_property
+    def default(self):
+        """General-purpose model used for scoping and research."""
+        return create_chat_model(settings.default_model)
+
+    @functools.cached_property
+    def supervisor(self):
+        """Model that coordinates the research supervisor."""
+        return create_chat_model(settings.supervisor_model)
+
+    @functools.cached_property
+    def summarization(self):
+        """Model that summarizes fetched webpages."""
+        return create_chat_model(settings.summarization_model)
+
+    @functools.cached_property
+    def compress(self):
+        """Model that compresses researcher findings."""
+        model_name = settings.compress_model
+        model = create_chat_model(model_name, max_tokens=settings.compress_model_max_tokens)
+        return with_semantic_cache(
+            with_prompt_cache(with_batch_api(model, model_name), model_name),
+            "compress",
+            key_fn=_research_findings_key,
+        )
+
+    @functools.cached_property
+    def context_summarizer(self):
+        """Model that folds older researcher turns into a rolling summary.
+
+        The summary length target (ROLLING_SUMMARY_MAX_TOKENS) is enforced by
+        the prompt; the output cap is the compress model's, leaving headroom
+        for reasoning tokens and summaries that run slightly over.
+        """
+        model_name = settings.compress_model
+        return with_prompt_cache(
+            create_chat_model(model_name, max_tokens=settings.compress_model_max_tokens), model_name
+        )
+
+    @functools.cached_property
+    def report_writer(self):
+        """Model that writes the final report."""
+        model_name = settings.writer_model
+        return with_prompt_cache(
+            create_chat_model(model_name, max_tokens=settings.report_writer_model_max_tokens), model_name
+        )
+
+    @functools.cached_property
+    def prediction_report_writer(self):
+        """Model that writes the final report against a predicted output.
+
+        Predicted outputs reject max_completion_tokens, so no output cap is
+        set, and streaming is off so the prediction token counts are reported.
+        """
+        model_name = settings.writer_model
+        return with_prompt_cache(create_chat_model(model_name, streaming=False), model_name)
+
+    @functools.cached_property
+    def draft_writer(self):
+        """Model that writes and refines the draft report."""
+        return create_chat_model(
+            settings.writer_model, max_tokens=settings.draft_writer_model_max_tokens
+        )
+
+    @functools.cached_property
+    def embeddings(self):
+        """Embedding model used by the semantic response cache."""
+        return OpenAIEmbeddings(
+            model=settings.semantic_cache_embedding_model,
+            base_url=settings.openai_base_url,
+            http_async_client=_SHARED_HTTPX,
+        )
+
 
-default_model = create_chat_model(DEFAULT_MODEL)
-supervisor_model = create_chat_model(SUPERVISOR_MODEL)
-summarization_model = create_chat_model(SUMMARIZATION_MODEL)
-compress_model = create_chat_model(COMPRESS_MODEL, max_tokens=COMPRESS_MODEL_MAX_TOKENS)
-report_writer_model = create_chat_model(WRITER_MODEL, max_tokens=REPORT_WRITER_MODEL_MAX_TOKENS)
-draft_writer_model = create_chat_model(WRITER_MODEL, max_tokens=DRAFT_WRITER_MODEL_MAX_TOKENS)
+models = _Models()
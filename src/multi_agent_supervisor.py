@@ -19,7 +19,9 @@ from deep_research.config import (
     MAX_RESEARCHER_ITERATIONS as max_researcher_iterations,
 )
 from deep_research.config import (
-    supervisor_model,
+    SUPERVISOR_MODEL,
+    models,
+    with_prompt_cache,
 )
 from deep_research.prompts import (
     lead_researcher_with_multiple_steps_diffusion_double_check_prompt,
@@ -77,7 +79,10 @@ except ImportError:
 # ===== CONFIGURATION =====
 
 supervisor_tools = [ConductResearch, ResearchComplete, think_tool,refine_draft_report]
-supervisor_model_with_tools = supervisor_model.bind_tools(supervisor_tools)
+# The supervisor prompt is re-sent on every supervision iteration, so mark it cacheable
+supervisor_model_with_tools = with_prompt_cache(
+    models.supervisor.bind_tools(supervisor_tools), SUPERVISOR_MODEL
+)
 
 # ===== SUPERVISOR NODES =====
 
@@ -187,19 +192,24 @@ async def supervisor_tools(state: SupervisorState) -> Command[Literal["superviso
 
             # Handle ConductResearch calls (asynchronous)
             if conduct_research_calls:
-                # Launch parallel research agents
-                coros = [
-                    researcher_agent.ainvoke({
-                        "researcher_messages": [
-                            HumanMessage(content=tool_call["args"]["research_topic"])
-                        ],
-                        "research_topic": tool_call["args"]["research_topic"]
-                    }) 
-                    for tool_call in conduct_research_calls
-                ]
-
-                # Wait for all research to complete
-                tool_results = await asyncio.gather(*coros)
+                # Cap the number of researchers running at once, even if the
+                # supervisor requests more units than allowed
+                semaphore = asyncio.Semaphore(max_concurrent_researchers)
+
+                async def run_researcher(research_topic: str) -> dict:
+                    async with semaphore:
+                        return await researcher_agent.ainvoke({
+                            "researcher_messages": [HumanMessage(content=research_topic)],
+                            "research_topic": research_topic
+                        })
+
+                # Launch parallel research agents and wait for all of them to complete
+                async with asyncio.TaskGroup() as task_group:
+                    tasks = [
+                        task_group.create_task(run_researcher(tool_call["args"]["research_topic"]))
+                        for tool_call in conduct_research_calls
+                    ]
+                tool_results = [task.result() for task in tasks]
 
                 # Format research results as tool messages
                 # Each sub-agent returns compressed research findings in result["compressed_research"]
@@ -0,0 +1,135 @@
+"""Provider Prompt Caching Helpers.
+
+This module wires provider-side prompt caching into the chat models built by
+the config factory. Anthropic requires explicit cache breakpoints on the
+static system prompt, while OpenAI caches identical prompt prefixes
+automatically as long as the static content leads the request.
+"""
+
+import logging
+from typing import Any
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.messages import BaseMessage, SystemMessage
+from langchain_core.outputs import ChatGeneration, LLMResult
+from langchain_core.runnables import Runnable, RunnableConfig
+
+logger = logging.getLogger(__name__)
+
+ANTHROPIC_PROMPT_CACHE_BETA = "prompt-caching-2024-07-31"
+EPHEMERAL_CACHE_CONTROL = {"type": "ephemeral"}
+
+# ===== MESSAGE REWRITING =====
+
+def _mark_cacheable(message: SystemMessage) -> SystemMessage:
+    """Attach an ephemeral cache breakpoint to a system message.
+
+    Args:
+        message: System message holding a static prompt
+
+    Returns:
+        Copy of the message with its last content block marked cacheable
+    """
+    if isinstance(message.content, str):
+        blocks = [{"type": "text", "text": message.content}]
+    else:
+        blocks = [
+            {"type": "text", "text": block} if isinstance(block, str) else dict(block)
+            for block in message.content
+        ]
+    if not blocks:
+        return message
+    blocks[-1]["cache_control"] = EPHEMERAL_CACHE_CONTROL
+    return message.model_copy(update={"content": blocks})
+
+def prepare_cached_messages(messages: list[BaseMessage], provider: str | None) -> list[BaseMessage]:
+    """Rewrite a message list so the provider can cache its static prefix.
+
+    System messages are moved ahead of the conversation so the prompt prefix
+    stays byte-identical across calls. For Anthropic, the first system
+    message additionally carries an ephemeral cache breakpoint.
+
+    Args:
+        messages: Messages about to be sent to the model
+        provider: Provider name parsed from the model string
+
+    Returns:
+        Reordered (and for Anthropic, annotated) message list
+    """
+    system_messages = [m for m in messages if isinstance(m, SystemMessage)]
+    if not system_messages:
+        return messages
+    other_messages = [m for m in messages if not isinstance(m, SystemMessage)]
+    if provider == "anthropic":
+        system_messages[0] = _mark_cacheable(system_messages[0])
+    return system_messages + other_messages
+
+class PromptCachedModel(Runnable):
+    """Thin wrapper that prepares every prompt for provider prefix caching.
+
+    Invocation kwargs are forwarded untouched to the wrapped model, so call
+    sites can keep passing provider options through ``invoke``/``ainvoke``.
+    """
+
+    def __init__(self, model: Runnable, provider: str | None):
+        """Wrap a chat model.
+
+        Args:
+            model: Chat model (or any runnable accepting a message list)
+            provider: Provider name parsed from the model string
+        """
+        self.model = model
+        self.provider = provider
+
+    def _prepare(self, input: Any) -> Any:
+        if isinstance(input, list):
+            return prepare_cached_messages(input, self.provider)
+        return input
+
+    def invoke(self, input: Any, config: RunnableConfig | None = None, **kwargs: Any) -> Any:
+        """Invoke the wrapped model with a cache-friendly prompt."""
+        return self.model.invoke(self._prepare(input), config, **kwargs)
+
+    async def ainvoke(self, input: Any, config: RunnableConfig | None = None, **kwargs: Any) -> Any:
+        """Asynchronously invoke the wrapped model with a cache-friendly prompt."""
+        return await self.model.ainvoke(self._prepare(input), config, **kwargs)
+
+# ===== USAGE TRACKING =====
+
+class PromptCacheUsageHandler(BaseCallbackHandler):
+    """Callback handler that logs the running prompt cache hit rate.
+
+    Reads the provider-normalized ``usage_metadata`` of each generation, which
+    exposes OpenAI ``prompt_tokens_details.cached_tokens`` and Anthropic
+    ``cache_read_input_tokens`` as ``input_token_details.cache_read``.
+    """
+
+    def __init__(self) -> None:
+        """Initialize token counters."""
+        self.input_tokens = 0
+        self.cached_tokens = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of input tokens served from the provider prompt cache."""
+        return self.cached_tokens / self.input_tokens if self.input_tokens else 0.0
+
+    def on_llm_end(self, response: LLMResult, **kwargs: Any) -> None:
+        """Accumulate cached and total input tokens from a finished call."""
+        for generations in response.generations:
+            for generation in generations:
+                if not isinstance(generation, ChatGeneration):
+                    continue
+                usage = getattr(generation.message, "usage_metadata", None)
+                if not usage:
+                    continue
+                cached = (usage.get("input_token_details") or {}).get("cache_read") or 0
+                self.input_tokens += usage.get("input_tokens", 0)
+                self.cached_tokens += cached
+                logger.debug(
+                    "Prompt cache: %d/%d input tokens cached (cumulative hit rate %.1f%%)",
+                    cached, usage.get("input_tokens", 0), self.hit_rate * 100,
+                )
+
+# Shared across all models so the hit rate reflects the whole research run
+prompt_cache_usage = PromptCacheUsageHandler()
@@ -323,6 +323,32 @@ CRITICAL REQUIREMENTS:
 
 The cleaned findings will be used for final report generation, so comprehensiveness is critical."""
 
+rolling_summary_system_prompt = """You are maintaining the working memory of a research assistant that is partway through researching a topic with web searches. Older research turns are being removed from its context window and replaced by your summary.
+
+<Task>
+Compress the previous summary (if any) and the research turns you are given into a single updated summary of at most {max_tokens} tokens.
+The research assistant will continue working from this summary alone, so it must contain everything needed to avoid repeating searches and to answer the research topic.
+</Task>
+
+<Guidelines>
+1. Preserve all entities (people, organizations, products, places), URLs, dates, and numeric facts exactly as they appear.
+2. Keep track of which search queries have already been run and what they returned.
+3. Keep the assistant's open questions and remaining research gaps.
+4. Drop repetition, boilerplate page content, and anything irrelevant to the research topic.
+5. Output only the summary, with no preamble.
+</Guidelines>
+"""
+
+rolling_summary_human_message = """<Previous Summary>
+{previous_summary}
+</Previous Summary>
+
+<Research Turns>
+{research_turns}
+</Research Turns>
+
+Write the updated summary now."""
+
 final_report_generation_with_helpfulness_insightfulness_hit_citation_prompt = """Based on all the research conducted and draft report, create a comprehensive, well-structured answer to the overall research brief:
 <Research Brief>
 {research_brief}
@@ -5,31 +5,124 @@ This module implements a research agent that can perform iterative web searches
 and synthesis to answer complex research questions.
 """
 
-from deep_research.config import compress_model
-from deep_research.config import default_model as model
+import logging
+
+from deep_research.config import (
+    DEFAULT_MODEL,
+    ROLLING_SUMMARY_EVERY_N_TURNS,
+    ROLLING_SUMMARY_MAX_TOKENS,
+    models,
+    with_prompt_cache,
+)
 from deep_research.prompts import (
     compress_research_human_message,
     compress_research_system_prompt,
     research_agent_prompt,
+    rolling_summary_human_message,
+    rolling_summary_system_prompt,
 )
 from deep_research.state_research import ResearcherOutputState, ResearcherState
 from deep_research.utils import get_today_str, tavily_search, think_tool
 from langchain_core.messages import (
+    AIMessage,
+    BaseMessage,
     HumanMessage,
     SystemMessage,
     ToolMessage,
     filter_messages,
+    get_buffer_string,
 )
 from langgraph.graph import END, START, StateGraph
 from typing_extensions import Literal
 
+logger = logging.getLogger(__name__)
+
 # ===== CONFIGURATION =====
 
 # Set up tools and model binding
 tools = [tavily_search, think_tool]
 tools_by_name = {tool.name: tool for tool in tools}
 
-model_with_tools = model.bind_tools(tools)
+# The static research prompt is re-sent on every loop iteration, so mark it cacheable
+model_with_tools = with_prompt_cache(models.default.bind_tools(tools), DEFAULT_MODEL)
+
+# ===== CONTEXT MANAGEMENT =====
+
+# Finish reasons (OpenAI, Anthropic) that mean the output was cut off
+_TRUNCATED_FINISH_REASONS = {"length", "max_tokens"}
+
+def _query_length(messages: list[BaseMessage]) -> int:
+    """Count the leading messages that make up the research query."""
+    for i, message in enumerate(messages):
+        if isinstance(message, AIMessage):
+            return i
+    return len(messages)
+
+def get_research_context(state: ResearcherState) -> list[BaseMessage]:
+    """Build the messages sent to the researcher model.
+
+    Returns the research query, the rolling summary of older turns (if any),
+    and the turns that have not been summarized yet. The full history stays
+    in state for compression and raw notes.
+    """
+    messages = list(state["researcher_messages"])
+    context_summary = state.get("context_summary", "")
+    if not context_summary:
+        return messages
+
+    query_length = _query_length(messages)
+    summarized_count = state.get("summarized_message_count", query_length)
+    summary_message = HumanMessage(
+        content=f"<research_so_far>\n{context_summary}\n</research_so_far>"
+    )
+    return messages[:query_length] + [summary_message] + messages[summarized_count:]
+
+def condense_context(state: ResearcherState) -> dict:
+    """Fold older research turns into the rolling summary.
+
+    Runs before each model call. Once more than ROLLING_SUMMARY_EVERY_N_TURNS
+    turns (an AI message plus its tool results) are unsummarized, every turn
+    except the latest is compressed together with the previous summary, which
+    keeps the researcher's prompt roughly constant in size.
+    """
+    if ROLLING_SUMMARY_EVERY_N_TURNS <= 0:
+        return {}
+
+    messages = list(state["researcher_messages"])
+    summarized_count = state.get("summarized_message_count", _query_length(messages))
+    turn_starts = [
+        i for i, message in enumerate(messages)
+        if i >= summarized_count and isinstance(message, AIMessage)
+    ]
+    if len(turn_starts) <= ROLLING_SUMMARY_EVERY_N_TURNS:
+        return {}
+
+    cutoff = turn_starts[-1]
+    try:
+        response = models.context_summarizer.invoke([
+            SystemMessage(content=rolling_summary_system_prompt.format(max_tokens=ROLLING_SUMMARY_MAX_TOKENS)),
+            HumanMessage(content=rolling_summary_human_message.format(
+                previous_summary=state.get("context_summary", ""),
+                research_turns=get_buffer_string(messages[summarized_count:cutoff]),
+            )),
+        ])
+    except Exception as e:
+        logger.warning("Rolling summary failed, keeping full context: %s", e)
+        return {}
+
+    # Only advance past turns that actually made it into a complete summary;
+    # otherwise keep them in context and retry on the next iteration
+    summary = str(response.content)
+    metadata = response.response_metadata
+    finish_reason = metadata.get("finish_reason") or metadata.get("stop_reason")
+    if not summary.strip() or finish_reason in _TRUNCATED_FINISH_REASONS:
+        logger.warning("Rolling summary was empty or truncated (%s), keeping full context", finish_reason)
+        return {}
+
+    return {
+        "context_summary": summary,
+        "summarized_message_count": cutoff,
+    }
 
 # ===== AGENT NODES =====
 
@@ -45,7 +138,7 @@ def llm_call(state: ResearcherState):
     return {
         "researcher_messages": [
             model_with_tools.invoke(
-                [SystemMessage(content=research_agent_prompt)] + state["researcher_messages"]
+                [SystemMessage(content=research_agent_prompt)] + get_research_context(state)
             )
         ]
     }
@@ -75,7 +168,7 @@ def tool_node(state: ResearcherState):
 
     return {"researcher_messages": tool_outputs}
 
-def compress_research(state: ResearcherState) -> dict:
+async def compress_research(state: ResearcherState) -> dict:
     """Compress research findings into a concise summary.
 
     Takes all the research messages and tool outputs and creates
@@ -83,7 +176,7 @@ def compress_research(state: ResearcherState) -> dict:
     """
     system_message = compress_research_system_prompt.format(date=get_today_str())
     messages = [SystemMessage(content=system_message)] + state.get("researcher_messages", []) + [HumanMessage(content=compress_research_human_message)]
-    response = compress_model.invoke(messages)
+    response = await models.compress.ainvoke(messages)
 
     # Extract raw notes from tool and AI messages
     raw_notes = [
@@ -127,6 +220,7 @@ agent_builder = StateGraph(ResearcherState, output_schema=ResearcherOutputState)
 # Add nodes to the graph
 agent_builder.add_node("llm_call", llm_call)
 agent_builder.add_node("tool_node", tool_node)
+agent_builder.add_node("condense_context", condense_context)
 agent_builder.add_node("compress_research", compress_research)
 
 # Add edges to connect nodes
@@ -139,7 +233,8 @@ agent_builder.add_conditional_edges(
         "compress_research": "compress_research", # Provide final answer
     },
 )
-agent_builder.add_edge("tool_node", "llm_call") # Loop back for more research
+agent_builder.add_edge("tool_node", "condense_context") # Bound context before the next call
+agent_builder.add_edge("condense_context", "llm_call") # Loop back for more research
 agent_builder.add_edge("compress_research", END)
 
 # Compile the agent
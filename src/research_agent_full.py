@@ -11,8 +11,10 @@ The system orchestrates the complete research workflow from initial user
 input through final report delivery.
 """
 
+import logging
+
 # ===== Config =====
-from deep_research.config import report_writer_model as writer_model
+from deep_research.config import REPORT_USE_PREDICTION, models
 from deep_research.multi_agent_supervisor import supervisor_agent
 from deep_research.prompts import (
     final_report_generation_with_helpfulness_insightfulness_hit_citation_prompt,
@@ -27,6 +29,8 @@ from deep_research.utils import get_today_str
 from langchain_core.messages import HumanMessage
 from langgraph.graph import END, START, StateGraph
 
+logger = logging.getLogger(__name__)
+
 # ===== FINAL REPORT GENERATION =====
 
 
@@ -47,7 +51,31 @@ async def final_report_generation(state: AgentState):
         user_request=state.get("user_request", "")
     )
 
-    final_report = await writer_model.ainvoke([HumanMessage(content=final_report_prompt)])
+    messages = [HumanMessage(content=final_report_prompt)]
+    draft_report = state.get("draft_report", "")
+
+    final_report = None
+    if REPORT_USE_PREDICTION and draft_report:
+        # The final report largely follows the draft's structure, so offering it
+        # as a predicted output lets the provider accept matching spans cheaply
+        try:
+            final_report = await models.prediction_report_writer.ainvoke(
+                messages, prediction={"type": "content", "content": draft_report}
+            )
+        except Exception as e:
+            # Not every OpenAI model accepts predictions (e.g. reasoning models)
+            logger.warning("Predicted output rejected, writing the report without it: %s", e)
+        else:
+            token_usage = final_report.response_metadata.get("token_usage") or {}
+            details = token_usage.get("completion_tokens_details") or {}
+            if details:
+                logger.info(
+                    "Report prediction: %s accepted, %s rejected tokens",
+                    details.get("accepted_prediction_tokens", 0),
+                    details.get("rejected_prediction_tokens", 0),
+                )
+    if final_report is None:
+        final_report = await models.report_writer.ainvoke(messages)
 
     return {
         "final_report": final_report.content, 
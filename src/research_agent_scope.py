@@ -11,8 +11,7 @@ whether sufficient context exists to proceed with research.
 
 from datetime import datetime
 
-from deep_research.config import default_model as creative_model
-from deep_research.config import default_model as model
+from deep_research.config import models
 from deep_research.prompts import (
     draft_report_generation_prompt,
     transform_messages_into_research_topic_human_msg_prompt,
@@ -45,7 +44,7 @@ def clarify_with_user(state: AgentState) -> Command[Literal["write_research_brie
     """
     """
     # Set up structured output model
-    structured_output_model = model.with_structured_output(ClarifyWithUser)
+    structured_output_model = models.default.with_structured_output(ClarifyWithUser)
 
     # Invoke the model with clarification instructions
     response = structured_output_model.invoke([
@@ -74,7 +73,7 @@ def write_research_brief(state: AgentState) -> Command[Literal["write_draft_repo
     and contains all necessary details for effective research.
     """
     # Set up structured output model
-    structured_output_model = model.with_structured_output(ResearchQuestion)
+    structured_output_model = models.default.with_structured_output(ResearchQuestion)
 
     # Generate research brief from conversation history
     response = structured_output_model.invoke([
@@ -96,7 +95,7 @@ def write_draft_report(state: AgentState) -> Command[Literal["__end__"]]:
     Synthesizes all research findings into a comprehensive final report
     """
     # Set up structured output model
-    structured_output_model = creative_model.with_structured_output(DraftReport)
+    structured_output_model = models.default.with_structured_output(DraftReport)
     research_brief = state.get("research_brief", "")
     draft_report_prompt = draft_report_generation_prompt.format(
         research_brief=research_brief,
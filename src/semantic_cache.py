@@ -0,0 +1,246 @@
+"""Semantic Response Cache.
+
+This module provides an embedding-based response cache for models that are
+repeatedly called with near-duplicate prompts, such as webpage summarization
+and research compression. A prompt whose embedding is close enough to a
+previously answered one reuses that answer instead of calling the model.
+
+Requires the optional ``faiss-cpu`` and ``numpy`` packages
+(``pip install thinkdepthai_deep_research[semantic-cache]``).
+"""
+
+import hashlib
+import logging
+import pickle
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+from langchain_core.embeddings import Embeddings
+from langchain_core.messages import BaseMessage, SystemMessage, get_buffer_string
+from langchain_core.runnables import Runnable, RunnableConfig
+
+logger = logging.getLogger(__name__)
+
+def message_key(input: Any) -> str:
+    """Build a cache key from the non-system messages of a prompt.
+
+    System messages are shared by every call and would only dilute the
+    similarity between prompts, so they are left out.
+    """
+    if isinstance(input, list) and all(isinstance(m, BaseMessage) for m in input):
+        return get_buffer_string([m for m in input if not isinstance(m, SystemMessage)])
+    return str(input)
+
+class SemanticCacheWrapper(Runnable):
+    """Runnable that answers semantically similar prompts from a cache.
+
+    The cache key is the variable part of the prompt, as returned by
+    ``key_fn``; static template text must be excluded, otherwise unrelated
+    prompts look alike. Keys are first checked for an exact (hash) match, then
+    embedded and looked up in a FAISS inner-product index over normalized
+    vectors, i.e. by cosine similarity. Long keys are split into chunks
+    sampled across the whole text and their embeddings averaged, so pages that
+    share a long header (e.g. site navigation) still differ by their body. Calls that pass extra invocation
+    kwargs bypass the cache because those options can change the output.
+    """
+
+    def __init__(
+        self,
+        base_model: Runnable,
+        embed_model: Embeddings,
+        threshold: float = 0.92,
+        ttl: float = 3600,
+        index_path: Path | None = None,
+        max_chars: int = 8000,
+        max_chunks: int = 8,
+        key_fn: Callable[[Any], str] = message_key,
+    ):
+        """Wrap a model with a semantic cache.
+
+        Args:
+            base_model: Model (or runnable) producing responses on cache misses
+            embed_model: Embedding model used to vectorize cache keys
+            threshold: Minimum cosine similarity for a cache hit
+            ttl: Seconds a cached response stays valid
+            index_path: Optional file to load the cache from and persist it to
+            max_chars: Characters per embedded chunk of the key
+            max_chunks: Most chunks embedded per key, spread evenly over the key
+            key_fn: Extracts the variable content of an input to key the cache on
+        """
+        try:
+            import faiss
+            import numpy as np
+        except ImportError as e:
+            raise ImportError(
+                "The semantic cache requires faiss-cpu and numpy. "
+                "Install them with `pip install faiss-cpu numpy`."
+            ) from e
+
+        self._faiss = faiss
+        self._np = np
+        self.base_model = base_model
+        self.embed_model = embed_model
+        self.threshold = threshold
+        self.ttl = ttl
+        self.index_path = index_path
+        self.max_chars = max_chars
+        self.max_chunks = max_chunks
+        self.key_fn = key_fn
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._index = None
+        # (created_at, response) per index row, in insertion (and thus expiry) order
+        self._entries: list[tuple[float, Any]] = []
+        # Exact key hash -> (created_at, response)
+        self._exact: dict[str, tuple[float, Any]] = {}
+        if index_path is not None:
+            self._load()
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups answered from the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    # ===== CACHE OPERATIONS =====
+
+    def _key(self, input: Any) -> tuple[str, list[str]]:
+        """Return the exact-match digest and the chunks to embed for an input."""
+        key = self.key_fn(input)
+        chunks = [key[i:i + self.max_chars] for i in range(0, len(key), self.max_chars)] or [key]
+        if len(chunks) > self.max_chunks:
+            step = len(chunks) / self.max_chunks
+            chunks = [chunks[int(i * step)] for i in range(self.max_chunks)]
+        return hashlib.sha256(key.encode("utf-8")).hexdigest(), chunks
+
+    def _normalize(self, embeddings: list[list[float]]):
+        """Average chunk embeddings into one unit-length query vector."""
+        vector = self._np.asarray(embeddings, dtype="float32").mean(axis=0, keepdims=True)
+        self._faiss.normalize_L2(vector)
+        return vector
+
+    def _record(self, hit: bool, reason: str) -> None:
+        if hit:
+            self.hits += 1
+            logger.debug("Semantic cache hit (%s, hit rate %.1f%%)", reason, self.hit_rate * 100)
+        else:
+            self.misses += 1
+
+    def _lookup_exact(self, digest: str) -> Any | None:
+        with self._lock:
+            self._evict_expired()
+            entry = self._exact.get(digest)
+            if entry is None:
+                return None
+            self._record(True, "exact match")
+            return entry[1]
+
+    def _lookup_similar(self, vector) -> Any | None:
+        with self._lock:
+            self._evict_expired()
+            if self._index is None or self._index.ntotal == 0:
+                self._record(False, "empty")
+                return None
+            scores, ids = self._index.search(vector, 1)
+            score, idx = scores[0][0], ids[0][0]
+            if idx < 0 or score < self.threshold:
+                self._record(False, "no similar key")
+                return None
+            self._record(True, f"similarity {score:.3f}")
+            return self._entries[idx][1]
+
+    def _store(self, digest: str, vector, response: Any) -> None:
+        with self._lock:
+            now = time.time()
+            if self._index is None:
+                self._index = self._faiss.IndexFlatIP(vector.shape[1])
+            self._index.add(vector)
+            self._entries.append((now, response))
+            self._exact[digest] = (now, response)
+
+    def _evict_expired(self) -> None:
+        """Drop entries older than the TTL; caller must hold the lock."""
+        cutoff = time.time() - self.ttl
+        expired = 0
+        while expired < len(self._entries) and self._entries[expired][0] < cutoff:
+            expired += 1
+        if expired:
+            self._index.remove_ids(self._np.arange(expired, dtype="int64"))
+            del self._entries[:expired]
+        if self._exact:
+            self._exact = {k: v for k, v in self._exact.items() if v[0] >= cutoff}
+
+    def _load(self) -> None:
+        entries_path = self.index_path.with_suffix(".pkl")
+        if not (self.index_path.exists() and entries_path.exists()):
+            return
+        try:
+            index = self._faiss.read_index(str(self.index_path))
+            with open(entries_path, "rb") as f:
+                data = pickle.load(f)
+        except Exception as e:
+            logger.warning("Ignoring unreadable semantic cache at %s: %s", self.index_path, e)
+            return
+        if index.ntotal != len(data["entries"]):
+            logger.warning("Ignoring inconsistent semantic cache at %s", self.index_path)
+            return
+        self._index, self._entries, self._exact = index, data["entries"], data["exact"]
+
+    def persist(self) -> None:
+        """Write the index and cached responses to ``index_path``."""
+        if self.index_path is None or self._index is None:
+            return
+        with self._lock:
+            self._evict_expired()
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            self._faiss.write_index(self._index, str(self.index_path))
+            with open(self.index_path.with_suffix(".pkl"), "wb") as f:
+                pickle.dump({"entries": self._entries, "exact": self._exact}, f)
+
+    # ===== RUNNABLE INTERFACE =====
+
+    def invoke(self, input: Any, config: RunnableConfig | None = None, **kwargs: Any) -> Any:
+        """Return a cached response for a similar prompt, or call the model."""
+        if kwargs:
+            return self.base_model.invoke(input, config, **kwargs)
+        digest, chunks = self._key(input)
+        cached = self._lookup_exact(digest)
+        if cached is not None:
+            return cached
+        try:
+            vector = self._normalize(self.embed_model.embed_documents(chunks))
+        except Exception as e:
+            logger.warning("Semantic cache embedding failed, calling model directly: %s", e)
+            return self.base_model.invoke(input, config)
+
+        cached = self._lookup_similar(vector)
+        if cached is not None:
+            return cached
+        response = self.base_model.invoke(input, config)
+        self._store(digest, vector, response)
+        return response
+
+    async def ainvoke(self, input: Any, config: RunnableConfig | None = None, **kwargs: Any) -> Any:
+        """Asynchronously return a cached response for a similar prompt, or call the model."""
+        if kwargs:
+            return await self.base_model.ainvoke(input, config, **kwargs)
+        digest, chunks = self._key(input)
+        cached = self._lookup_exact(digest)
+        if cached is not None:
+            return cached
+        try:
+            vector = self._normalize(await self.embed_model.aembed_documents(chunks))
+        except Exception as e:
+            logger.warning("Semantic cache embedding failed, calling model directly: %s", e)
+            return await self.base_model.ainvoke(input, config)
+
+        cached = self._lookup_similar(vector)
+        if cached is not None:
+            return cached
+        response = await self.base_model.ainvoke(input, config)
+        self._store(digest, vector, response)
+        return response
@@ -20,13 +20,17 @@ class ResearcherState(TypedDict):
 
     This state tracks the researcher's conversation, iteration count for limiting
     tool calls, the research topic being investigated, compressed findings,
-    and raw research notes for detailed analysis.
+    and raw research notes for detailed analysis. Older turns are folded into
+    context_summary, and summarized_message_count marks how many leading
+    messages it covers.
     """
     researcher_messages: Annotated[Sequence[BaseMessage], add_messages]
     tool_call_iterations: int
     research_topic: str
     compressed_research: str
     raw_notes: Annotated[List[str], operator.add]
+    context_summary: str
+    summarized_message_count: int
 
 class ResearcherOutputState(TypedDict):
     """
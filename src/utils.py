@@ -6,17 +6,18 @@ This module provides search and content processing utilities for the research ag
 including web search capabilities and content summarization tools.
 """
 
+import functools
 from datetime import datetime
 from pathlib import Path
 
-from deep_research.config import MAX_CONTEXT_LENGTH, summarization_model
-from deep_research.config import draft_writer_model as writer_model
+from deep_research.config import MAX_CONTEXT_LENGTH, models, with_semantic_cache
 from deep_research.prompts import (
     report_generation_with_draft_insight_prompt,
     summarize_webpage_prompt,
 )
 from deep_research.state_research import Summary
 from langchain_core.messages import HumanMessage
+from langchain_core.runnables import RunnableLambda
 from langchain_core.tools import InjectedToolArg, tool
 from tavily import TavilyClient
 from typing_extensions import Annotated, List, Literal
@@ -40,6 +41,23 @@ def get_current_dir() -> Path:
     except NameError:  # __file__ is not defined
         return Path.cwd()
 
+def _build_summarization_messages(inputs: dict) -> list[HumanMessage]:
+    """Format the webpage summarization prompt from its variables."""
+    return [HumanMessage(content=summarize_webpage_prompt.format(**inputs))]
+
+@functools.cache
+def get_webpage_summarizer():
+    """Get the structured webpage summarizer.
+
+    Takes {"webpage_content", "date"} as input. Built once so the semantic
+    response cache in front of it (when enabled) persists across calls; the
+    cache is keyed on the webpage content only, not the fixed prompt template.
+    """
+    summarizer = RunnableLambda(_build_summarization_messages) | models.summarization.with_structured_output(Summary)
+    return with_semantic_cache(
+        summarizer, "summarization", key_fn=lambda inputs: inputs["webpage_content"]
+    )
+
 # ===== CONFIGURATION =====
 
 tavily_client = TavilyClient()
@@ -86,16 +104,11 @@ def summarize_webpage_content(webpage_content: str) -> str:
         Formatted summary with key excerpts
     """
     try:
-        # Set up structured output model for summarization
-        structured_model = summarization_model.with_structured_output(Summary)
-
         # Generate summary
-        summary = structured_model.invoke([
-            HumanMessage(content=summarize_webpage_prompt.format(
-                webpage_content=webpage_content, 
-                date=get_today_str()
-            ))
-        ])
+        summary = get_webpage_summarizer().invoke({
+            "webpage_content": webpage_content,
+            "date": get_today_str()
+        })
 
         # Format summary with clear structure
         formatted_summary = (
@@ -261,6 +274,6 @@ def refine_draft_report(research_brief: Annotated[str, InjectedToolArg],
         date=get_today_str()
     )
 
-    draft_report = writer_model.invoke([HumanMessage(content=draft_report_prompt)])
+    draft_report = models.draft_writer.invoke([HumanMessage(content=draft_report_prompt)])
 
     return draft_report.content
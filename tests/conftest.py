@@ -0,0 +1,7 @@
+"""Shared test setup."""
+
+import os
+
+# Config validates API keys and the Tavily client reads its key at import time
+os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+os.environ.setdefault("TAVILY_API_KEY", "tvly-test")
@@ -0,0 +1,135 @@
+"""Tests for routing compression calls through the OpenAI Batch API."""
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+from deep_research.batch_llm import BatchLLMWrapper
+from langchain_core.messages import AIMessage, HumanMessage
+
+
+class FakeBatchClient:
+    """Stand-in for the OpenAI async client's files and batches endpoints."""
+
+    def __init__(self, finish_after_polls=0):
+        self.finish_after_polls = finish_after_polls
+        self.polls = 0
+        self.requests = []
+        self.submitted = []
+        self.cancelled = []
+        self.files = SimpleNamespace(create=self._create_file, content=self._file_content)
+        self.batches = SimpleNamespace(create=self._create_batch, retrieve=self._retrieve, cancel=self._cancel)
+
+    async def _create_file(self, file, purpose):
+        self.requests = [json.loads(line) for line in file[1].decode().splitlines()]
+        return SimpleNamespace(id="file-in")
+
+    def _job(self, status):
+        return SimpleNamespace(id="batch-1", status=status, output_file_id="file-out" if status == "completed" else None)
+
+    async def _create_batch(self, input_file_id, endpoint, completion_window):
+        self.submitted.append(len(self.requests))
+        return self._job("completed" if self.finish_after_polls == 0 else "in_progress")
+
+    async def _retrieve(self, batch_id):
+        self.polls += 1
+        return self._job("completed" if self.polls >= self.finish_after_polls else "in_progress")
+
+    async def _cancel(self, batch_id):
+        self.cancelled.append(batch_id)
+
+    async def _file_content(self, file_id):
+        lines = [
+            json.dumps({
+                "custom_id": request["custom_id"],
+                "response": {
+                    "status_code": 200,
+                    "body": {
+                        "model": "gpt-test",
+                        "choices": [{"message": {"content": "batched " + request["body"]["messages"][0]["content"]}}],
+                    },
+                },
+            })
+            for request in self.requests
+        ]
+        return SimpleNamespace(text="\n".join(lines))
+
+
+class FakeModel:
+    """Stand-in for ChatOpenAI that answers direct calls immediately."""
+
+    model_name = "gpt-test"
+    max_tokens = None
+
+    def __init__(self, client, delay=0.0):
+        self.root_async_client = client
+        self.delay = delay
+        self.direct_calls = []
+
+    async def ainvoke(self, messages, config=None, **kwargs):
+        self.direct_calls.append(messages[0].content)
+        await asyncio.sleep(self.delay)
+        return AIMessage(content="direct " + messages[0].content)
+
+
+def ask(text):
+    return [HumanMessage(content=text)]
+
+
+def test_concurrent_calls_share_one_batch():
+    client = FakeBatchClient()
+    model = FakeModel(client)
+    wrapper = BatchLLMWrapper(model, window=0.01)
+
+    async def run():
+        return await asyncio.gather(wrapper.ainvoke(ask("a")), wrapper.ainvoke(ask("b")))
+
+    results = asyncio.run(run())
+    assert [r.content for r in results] == ["batched a", "batched b"]
+    assert client.submitted == [2]
+    assert model.direct_calls == []
+
+
+def test_call_during_running_flush_is_not_stranded():
+    client = FakeBatchClient()
+    # The lone first call is made directly and is still in flight when the second arrives
+    model = FakeModel(client, delay=0.05)
+    wrapper = BatchLLMWrapper(model, window=0.01)
+
+    async def run():
+        first = asyncio.create_task(wrapper.ainvoke(ask("a")))
+        await asyncio.sleep(0.02)
+        second = await asyncio.wait_for(wrapper.ainvoke(ask("b")), timeout=1)
+        return await first, second
+
+    first, second = asyncio.run(run())
+    assert first.content == "direct a"
+    assert second.content == "direct b"
+
+
+def test_batch_past_max_wait_is_cancelled_and_called_directly():
+    client = FakeBatchClient(finish_after_polls=100)
+    model = FakeModel(client)
+    wrapper = BatchLLMWrapper(model, window=0.01, poll_interval=0.01, max_wait=0.03)
+
+    async def run():
+        return await asyncio.gather(wrapper.ainvoke(ask("a")), wrapper.ainvoke(ask("b")))
+
+    results = asyncio.run(run())
+    assert [r.content for r in results] == ["direct a", "direct b"]
+    assert client.cancelled == ["batch-1"]
+
+
+def test_cancelled_caller_does_not_break_the_batch():
+    client = FakeBatchClient(finish_after_polls=2)
+    model = FakeModel(client)
+    wrapper = BatchLLMWrapper(model, window=0.01, poll_interval=0.01)
+
+    async def run():
+        cancelled = asyncio.create_task(wrapper.ainvoke(ask("a")))
+        kept = asyncio.create_task(wrapper.ainvoke(ask("b")))
+        await asyncio.sleep(0.02)
+        cancelled.cancel()
+        return await kept
+
+    assert asyncio.run(run()).content == "batched b"
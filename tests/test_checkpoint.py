@@ -0,0 +1,44 @@
+"""Tests for the zstd-compressed in-memory checkpointer."""
+
+import operator
+from typing import Annotated
+
+from deep_research.checkpoint import CompressedMemorySaver, ZstdSerializer
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+from langgraph.graph import END, START, StateGraph
+from typing_extensions import TypedDict
+
+
+def test_serializer_round_trips_messages():
+    serde = ZstdSerializer()
+    obj = {"messages": [HumanMessage(content="topic"), AIMessage(content="notes " * 500)]}
+
+    type_, payload = serde.dumps_typed(obj)
+
+    assert type_.endswith("+zstd")
+    assert len(payload) < len(JsonPlusSerializer().dumps_typed(obj)[1])
+    assert serde.loads_typed((type_, payload)) == obj
+
+
+def test_serializer_reads_uncompressed_payloads():
+    obj = {"notes": ["a", "b"]}
+    assert ZstdSerializer().loads_typed(JsonPlusSerializer().dumps_typed(obj)) == obj
+
+
+class NotesState(TypedDict):
+    notes: Annotated[list[str], operator.add]
+
+
+def test_saver_resumes_thread_state():
+    builder = StateGraph(NotesState)
+    builder.add_node("take_note", lambda state: {"notes": [f"note {len(state['notes'])}"]})
+    builder.add_edge(START, "take_note")
+    builder.add_edge("take_note", END)
+    graph = builder.compile(checkpointer=CompressedMemorySaver())
+    config = {"configurable": {"thread_id": "t"}}
+
+    graph.invoke({"notes": []}, config)
+    state = graph.invoke({"notes": []}, config)
+
+    assert state["notes"] == ["note 0", "note 1"]
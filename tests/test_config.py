@@ -0,0 +1,41 @@
+"""Tests for the shared model configuration."""
+
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from deep_research import config
+
+
+class OkHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep connections alive so the pool reuses them
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), OkHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}/"
+    server.shutdown()
+
+
+def test_shared_http_client_survives_new_event_loops(server_url):
+    for _ in range(2):
+        response = asyncio.run(config._SHARED_HTTPX.get(server_url))
+        assert response.text == "ok"
+
+
+def test_prediction_requires_an_openai_writer():
+    with pytest.raises(ValueError, match="REPORT_USE_PREDICTION"):
+        config.Settings(report_use_prediction=True, writer_model="anthropic:claude-sonnet-4-5")
+    assert config.Settings(report_use_prediction=True, writer_model="openai:gpt-4.1").report_use_prediction
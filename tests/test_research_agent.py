@@ -0,0 +1,90 @@
+"""Tests for the researcher's rolling context summary."""
+
+import pytest
+from deep_research import research_agent
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+
+class FakeSummarizer:
+    """Stand-in for models.context_summarizer that records its prompts."""
+
+    def __init__(self, content="summary", finish_reason="stop"):
+        self.content = content
+        self.finish_reason = finish_reason
+        self.calls = []
+
+    def invoke(self, messages):
+        self.calls.append(messages)
+        return AIMessage(content=self.content, response_metadata={"finish_reason": self.finish_reason})
+
+
+def make_turn(i):
+    """Build one researcher turn: an AI tool call and its tool result."""
+    call_id = f"call_{i}"
+    return [
+        AIMessage(content="", tool_calls=[{"name": "think_tool", "args": {"reflection": f"r{i}"}, "id": call_id}]),
+        ToolMessage(content=f"result {i}", name="think_tool", tool_call_id=call_id),
+    ]
+
+
+def make_state(num_turns, **extra):
+    messages = [HumanMessage(content="topic")]
+    for i in range(num_turns):
+        messages.extend(make_turn(i))
+    return {"researcher_messages": messages, **extra}
+
+
+@pytest.fixture
+def summarizer(monkeypatch):
+    fake = FakeSummarizer()
+    monkeypatch.setattr(research_agent.models, "context_summarizer", fake, raising=False)
+    monkeypatch.setattr(research_agent, "ROLLING_SUMMARY_EVERY_N_TURNS", 3)
+    return fake
+
+
+def test_no_fold_below_threshold(summarizer):
+    assert research_agent.condense_context(make_state(3)) == {}
+    assert summarizer.calls == []
+
+
+def test_fold_keeps_query_and_latest_turn(summarizer):
+    state = make_state(4)
+    update = research_agent.condense_context(state)
+
+    # Turns 0-2 (messages 1..6) are summarized; turn 3 starts at index 7
+    assert update == {"context_summary": "summary", "summarized_message_count": 7}
+    turns_text = summarizer.calls[0][1].content
+    assert "result 2" in turns_text and "result 3" not in turns_text
+
+    context = research_agent.get_research_context({**state, **update})
+    assert context[0].content == "topic"
+    assert "summary" in context[1].content
+    assert context[2:] == state["researcher_messages"][7:]
+
+
+def test_second_fold_starts_after_previous_summary(summarizer):
+    state = make_state(8, context_summary="old summary", summarized_message_count=7)
+    update = research_agent.condense_context(state)
+
+    # Turns 3-6 (messages 7..14) are folded with the previous summary
+    assert update["summarized_message_count"] == 15
+    prompt = summarizer.calls[0][1].content
+    assert "old summary" in prompt
+    assert "result 3" in prompt and "result 2" not in prompt and "result 7" not in prompt
+
+
+@pytest.mark.parametrize("content,finish_reason", [("", "stop"), ("   ", "stop"), ("partial", "length")])
+def test_failed_summary_does_not_advance(summarizer, content, finish_reason):
+    summarizer.content = content
+    summarizer.finish_reason = finish_reason
+    state = make_state(4)
+
+    assert research_agent.condense_context(state) == {}
+    # Nothing was dropped: the full history is still sent to the model
+    assert research_agent.get_research_context(state) == state["researcher_messages"]
+
+
+def test_disabled(summarizer, monkeypatch):
+    monkeypatch.setattr(research_agent, "ROLLING_SUMMARY_EVERY_N_TURNS", 0)
+    assert research_agent.condense_context(make_state(10)) == {}
+
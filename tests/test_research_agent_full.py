@@ -0,0 +1,60 @@
+"""Tests for final report generation."""
+
+import asyncio
+
+import pytest
+from deep_research import research_agent_full
+from langchain_core.messages import AIMessage
+
+
+class FakeWriter:
+    """Stand-in for a report writer model that records its invocation kwargs."""
+
+    def __init__(self, content, error=None):
+        self.content = content
+        self.error = error
+        self.calls = []
+
+    async def ainvoke(self, messages, **kwargs):
+        self.calls.append(kwargs)
+        if self.error is not None:
+            raise self.error
+        return AIMessage(content=self.content)
+
+
+@pytest.fixture
+def writers(monkeypatch):
+    predicted = FakeWriter("predicted report")
+    plain = FakeWriter("plain report")
+    monkeypatch.setattr(research_agent_full.models, "prediction_report_writer", predicted, raising=False)
+    monkeypatch.setattr(research_agent_full.models, "report_writer", plain, raising=False)
+    monkeypatch.setattr(research_agent_full, "REPORT_USE_PREDICTION", True)
+    return predicted, plain
+
+
+def generate(draft_report="draft"):
+    state = {"notes": ["note"], "draft_report": draft_report}
+    return asyncio.run(research_agent_full.final_report_generation(state))["final_report"]
+
+
+def test_draft_is_sent_as_prediction(writers):
+    predicted, plain = writers
+
+    assert generate() == "predicted report"
+    assert predicted.calls[0]["prediction"] == {"type": "content", "content": "draft"}
+    assert plain.calls == []
+
+
+def test_rejected_prediction_falls_back_to_plain_writer(writers):
+    predicted, plain = writers
+    predicted.error = RuntimeError("400: prediction is not supported with this model")
+
+    assert generate() == "plain report"
+    assert plain.calls == [{}]
+
+
+def test_no_draft_skips_prediction(writers):
+    predicted, plain = writers
+
+    assert generate(draft_report="") == "plain report"
+    assert predicted.calls == []
@@ -0,0 +1,62 @@
+"""Tests for the semantic response cache."""
+
+import asyncio
+import string
+
+import pytest
+from langchain_core.embeddings import Embeddings
+from langchain_core.runnables import RunnableLambda
+
+pytest.importorskip("faiss")
+
+from deep_research.semantic_cache import SemanticCacheWrapper  # noqa: E402
+
+
+class LetterCountEmbeddings(Embeddings):
+    """Embeds text as its letter counts, so texts with the same letters match."""
+
+    def embed_query(self, text):
+        return [float(text.count(letter)) for letter in string.ascii_lowercase]
+
+    def embed_documents(self, texts):
+        return [self.embed_query(text) for text in texts]
+
+
+def make_cache(**kwargs):
+    calls = []
+
+    def answer(page):
+        calls.append(page)
+        return f"summary {len(calls)}"
+
+    cache = SemanticCacheWrapper(RunnableLambda(answer), LetterCountEmbeddings(), key_fn=str, **kwargs)
+    return cache, calls
+
+
+def test_repeated_page_is_answered_from_cache():
+    cache, calls = make_cache()
+
+    assert cache.invoke("abc") == "summary 1"
+    assert cache.invoke("abc") == "summary 1"
+    assert asyncio.run(cache.ainvoke("cab")) == "summary 1"
+    assert len(calls) == 1
+    assert cache.hits == 2
+
+
+def test_pages_sharing_a_long_prefix_are_told_apart():
+    cache, calls = make_cache(max_chars=100)
+    boilerplate = "x" * 100
+    first, second = boilerplate + "a" * 100, boilerplate + "b" * 100
+
+    assert cache.invoke(first) == "summary 1"
+    assert cache.invoke(second) == "summary 2"
+    assert cache.invoke(first) == "summary 1"
+    assert len(calls) == 2
+
+
+def test_long_keys_embed_at_most_max_chunks():
+    cache, _ = make_cache(max_chars=10, max_chunks=4)
+
+    _, chunks = cache._key("".join(letter * 10 for letter in "abcdefghij"))
+
+    assert chunks == ["a" * 10, "c" * 10, "f" * 10, "h" * 10]